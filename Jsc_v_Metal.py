@@ -1,13 +1,15 @@
-import os
+import io
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 
+from jv_loader import iter_jv_files
+
 # Define the folder path containing the CSV files (Update this to your actual path)
 folder_path = "Fri1"
 
-# Get all CSV files that end with '_JV.csv' in the folder
-csv_files = [f for f in os.listdir(folder_path) if f.endswith("_JV.csv")]
+# Stream all '_JV.csv' files from the folder, or from a .zip / .tar.gz archive of it
+csv_files = iter_jv_files(folder_path)
 
 # Dictionary with cell metadata
 cells = {
@@ -27,9 +29,7 @@ metal_coverage_values = []
 num_fingers_values = []
 
 # Loop through each CSV file and process the data
-for file_name in csv_files:
-    file_path = os.path.join(folder_path, file_name)
-
+for file_name, raw_data in csv_files:
     # Convert filename to lowercase and check if it's "light"
     if "light" not in file_name.lower():
         print(f"Skipping file: {file_name} (Not 'light')")
@@ -40,7 +40,7 @@ for file_name in csv_files:
         cell_id = int(''.join(filter(str.isdigit, file_name.split('-')[1])))  # Extract numeric part after 'Fri1-'
 
         # Read the CSV file
-        light_data = pd.read_csv(file_path, header=None)
+        light_data = pd.read_csv(io.BytesIO(raw_data), header=None)
 
         # Extract `Jmpp (mA/sq cm)` from the ninth row (row index 8, second column index 1)
         jmpp = pd.to_numeric(light_data.iloc[8, 1], errors='coerce')
@@ -0,0 +1,74 @@
+import gc
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from measurement import read_batch, read_measurement
+
+# Compare memory held for a lot of synthetic '_JV.csv' files:
+#   python bench_measurement.py [num_files] [points_per_file]
+num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+num_points = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+
+# Build one synthetic light IV file (same 12-row header layout as the lab exports)
+voltage = np.linspace(-0.2, 0.7, num_points)
+current = 1e-9 * (np.exp(voltage / 0.026) - 1) - 0.03 + voltage / 1000
+header = [
+    "Sample,Fri1-1", "NumPads,1", "Pad Area (sq cm),1.0", "Voc (V),0.55", "Isc (A),-0.03",
+    "Jsc (mA/sq cm),-30", "Vmpp (V),0.45", "Impp (A),-0.027", "Jmpp (mA/sq cm),-27",
+    "Pmax (mW/sq cm),-12", "FF (%),75", "PCE (%),-12", "Voltage (V),Current (A)"
+]
+raw_data = ("\n".join(header) + "\n" + "\n".join(f"{v:.6g},{i:.6g}" for v, i in zip(voltage, current)) + "\n").encode()
+
+
+def per_file_dataframes():
+    # What the scripts keep per file: full DataFrame, metadata dict, IV Series
+    kept = []
+    for _ in range(num_files):
+        data = pd.read_csv(io.BytesIO(raw_data), header=None)
+        metadata = dict(zip(header[1:12], pd.to_numeric(data.iloc[1:12, 1], errors='coerce').values))
+        iv_data = data.iloc[12:].reset_index(drop=True)
+        kept.append((data, metadata,
+                     pd.to_numeric(iv_data.iloc[:, 0], errors='coerce'),
+                     pd.to_numeric(iv_data.iloc[:, 1], errors='coerce')))
+    return kept
+
+
+def measurements(dtype):
+    return [read_measurement(f"Fri1-{k % 16 + 1}-Light_JV.csv", io.BytesIO(raw_data), dtype)
+            for k in range(num_files)]
+
+
+def measure(name, function):
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    objects = len(gc.get_objects()) - objects_before
+    print(f"{name:28s} retained {retained / 1e6:7.1f} MB  peak {peak / 1e6:7.1f} MB  "
+          f"GC objects +{objects:7d}  {elapsed:6.2f} s")
+    del result
+
+
+with tempfile.TemporaryDirectory() as lot_folder:
+    for k in range(num_files):
+        with open(os.path.join(lot_folder, f"Fri1-{k % 16 + 1}-{k}-Light_JV.csv"), "wb") as handle:
+            handle.write(raw_data)
+
+    print(f"{num_files} files x {num_points} points (tracemalloc slows every row equally)")
+    measure("DataFrame + dict + Series", per_file_dataframes)
+    measure("Measurement list, float64", lambda: measurements(np.float64))
+    measure("Measurement list, float32", lambda: measurements(np.float32))
+    measure("read_batch, float64", lambda: read_batch(lot_folder, np.float64))
+    measure("read_batch, float32", lambda: read_batch(lot_folder, np.float32))
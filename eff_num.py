@@ -1,13 +1,16 @@
+import io
 import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 
+from jv_loader import iter_jv_files
+
 # Define the folder path containing the CSV files
 folder_path = os.path.expanduser("Fri1")
 
-# Get all CSV files that end with '_JV.csv' in the folder
-csv_files = [f for f in os.listdir(folder_path) if f.endswith("_JV.csv")]
+# Stream all '_JV.csv' files from the folder, or from a .zip / .tar.gz archive of it
+csv_files = iter_jv_files(folder_path)
 
 # Dictionary with cell metadata
 cells = {
@@ -25,9 +28,7 @@ efficiency_values = []
 num_fingers_values = []
 
 # Loop through each CSV file and process the data
-for file_name in csv_files:
-    file_path = os.path.join(folder_path, file_name)
-
+for file_name, raw_data in csv_files:
     # Convert filename to lowercase and check if it's "light"
     file_name_lower = file_name.lower()
     if "light" not in file_name_lower:
@@ -39,7 +40,7 @@ for file_name in csv_files:
         cell_id = int(''.join(filter(str.isdigit, file_name.split('-')[1])))  # Extracts numeric part after 'Fri1-'
 
         # Read the CSV file
-        light_data = pd.read_csv(file_path, header=None)
+        light_data = pd.read_csv(io.BytesIO(raw_data), header=None)
 
         # Extract Efficiency (`PCE (%)`) from metadata (12th row → row index **11**, second column → index **1**)
         efficiency = pd.to_numeric(light_data.iloc[11, 1], errors='coerce')  # Row index 11, second column
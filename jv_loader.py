@@ -0,0 +1,240 @@
+import io
+import os
+import queue
+import tarfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# Archive suffixes we can read `_JV.csv` members from without unpacking to disk
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar.gz", ".tgz", ".tar")
+
+# Number of members each worker decompresses per task (keeps the pool busy without
+# paying task overhead for every tiny CSV)
+MEMBERS_PER_TASK = 64
+
+# Number of inflated members each tarball worker may hold ahead of the consumer
+TAR_QUEUE_MEMBERS = 64
+
+# Marks the end of a tarball in its member queue
+_END_OF_ARCHIVE = object()
+
+
+def is_jv_file(name):
+    # Same rule as the scripts: only files ending in '_JV.csv' are measurements.
+    # macOS resource forks ("._Fri1-1-Light_JV.csv", "__MACOSX/...") are not.
+    parts = name.replace("\\", "/").split("/")
+    file_name = parts[-1]
+    return file_name.endswith("_JV.csv") and not file_name.startswith("._") and "__MACOSX" not in parts
+
+
+def sweep_type(file_name):
+    # Classify a measurement by its filename, matching the "dark"/"light" checks in the scripts
+    file_name_lower = os.path.basename(file_name).lower()
+    if "dark" in file_name_lower:
+        return "dark"
+    elif "light" in file_name_lower:
+        return "light"
+    return None
+
+
+def cell_id(file_name):
+    # Extract cell ID from filename (assuming format like "Fri1-10-Light_JV.csv")
+    digits = ''.join(filter(str.isdigit, os.path.basename(file_name).split('-')[1]))
+    return int(digits)
+
+
+def is_archive(path):
+    path_lower = path.lower()
+    return os.path.isfile(path) and path_lower.endswith(ZIP_SUFFIXES + TAR_SUFFIXES)
+
+
+def _is_zip(path):
+    return path.lower().endswith(ZIP_SUFFIXES)
+
+
+def _list_source(source):
+    # (csv_paths, archive_paths) for a source, in the order both iterators yield them:
+    # plain CSVs first, then each archive, all sorted by name
+    if is_archive(source):
+        return [], [source]
+    entries = sorted(os.listdir(source))
+    csv_paths = [os.path.join(source, f) for f in entries if is_jv_file(f)]
+    archive_paths = [os.path.join(source, f) for f in entries
+                     if f.lower().endswith(ZIP_SUFFIXES + TAR_SUFFIXES)]
+    return csv_paths, archive_paths
+
+
+def _bounded_map(pool, function, items, max_in_flight):
+    # Like pool.map, but only keeps `max_in_flight` tasks submitted at a time, so the
+    # pool never reads far ahead of the consumer
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(function, item))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _read_zip_members(archive_path, member_names):
+    # Each worker opens its own handle so members can be inflated concurrently
+    # (zlib releases the GIL while decompressing)
+    with zipfile.ZipFile(archive_path) as archive:
+        return [(os.path.basename(name), archive.read(name)) for name in member_names]
+
+
+def _zip_member_names(archive_path):
+    with zipfile.ZipFile(archive_path) as archive:
+        return [info.filename for info in archive.infolist()
+                if not info.is_dir() and is_jv_file(info.filename)]
+
+
+def _iter_tar_members(archive_path):
+    # A gzip stream can only be inflated front to back, so a tarball is read in
+    # streaming mode ("r|*"), one member at a time, without seeking or temporary files
+    with tarfile.open(archive_path, mode="r|*") as archive:
+        for member in archive:
+            if member.isfile() and is_jv_file(member.name):
+                yield os.path.basename(member.name), archive.extractfile(member)
+
+
+def _put_unless_stopped(member_queue, item, stop):
+    # Block on a full queue, but give up once the consumer has gone away
+    while not stop.is_set():
+        try:
+            member_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _stream_tar_into(archive_path, member_queue, stop):
+    # Worker: inflate one tarball front to back and hand its members over in order
+    try:
+        for file_name, member_file in _iter_tar_members(archive_path):
+            if not _put_unless_stopped(member_queue, (file_name, member_file.read()), stop):
+                return
+        item = _END_OF_ARCHIVE
+    except Exception as error:
+        item = error
+    _put_unless_stopped(member_queue, item, stop)
+
+
+class _TarPrefetcher:
+    # A gzip stream cannot be split, but separate tarballs can be inflated at the same
+    # time. Up to `workers` upcoming tarballs are read on their own threads, each into
+    # a bounded queue, and handed to the consumer in listing order.
+
+    def __init__(self, tar_paths, workers):
+        self._pending = deque(tar_paths)
+        self._queues = {}
+        self._workers = workers
+        self._stop = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._start_next()
+
+    def _start_next(self):
+        # Never start more tarballs than there are threads, so every queue being
+        # waited on has a running worker behind it
+        while self._pending and len(self._queues) < self._workers:
+            archive_path = self._pending.popleft()
+            member_queue = queue.Queue(maxsize=TAR_QUEUE_MEMBERS)
+            self._queues[archive_path] = member_queue
+            self._pool.submit(_stream_tar_into, archive_path, member_queue, self._stop)
+
+    def members(self, archive_path):
+        member_queue = self._queues[archive_path]
+        while True:
+            item = member_queue.get()
+            if item is _END_OF_ARCHIVE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        del self._queues[archive_path]
+        self._start_next()
+
+    def close(self):
+        self._stop.set()
+        self._pool.shutdown(wait=True)
+
+
+def _read_file(file_path):
+    with open(file_path, "rb") as handle:
+        return os.path.basename(file_path), handle.read()
+
+
+def iter_jv_files(source, workers=None):
+    # Yield (file_name, raw_bytes) for every '_JV.csv' measurement in `source`.
+    # `source` may be a folder (as before), a .zip, a .tar.gz/.tgz, or a folder
+    # holding several archives; nothing is extracted to disk.
+    csv_paths, archive_paths = _list_source(os.path.expanduser(source))
+
+    # At most two tasks per worker are in flight, so only a small window of files
+    # is held in memory ahead of the consumer
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+
+    # Tarballs get their own threads so a worker blocked on a full queue can never
+    # hold up the CSV or zip tasks
+    tar_prefetcher = _TarPrefetcher([p for p in archive_paths if not _is_zip(p)],
+                                    workers or os.cpu_count() or 1)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Plain CSVs are read one task per file
+            yield from _bounded_map(pool, _read_file, csv_paths, max_in_flight)
+
+            for archive_path in archive_paths:
+                if _is_zip(archive_path):
+                    # Zip members are inflated in batches across the pool
+                    member_names = _zip_member_names(archive_path)
+                    batches = [member_names[i:i + MEMBERS_PER_TASK]
+                               for i in range(0, len(member_names), MEMBERS_PER_TASK)]
+                    read_batch = partial(_read_zip_members, archive_path)
+                    for members in _bounded_map(pool, read_batch, batches, max_in_flight):
+                        yield from members
+                else:
+                    yield from tar_prefetcher.members(archive_path)
+    finally:
+        tar_prefetcher.close()
+
+
+class _ForwardOnlyStream(io.RawIOBase):
+    # Members of a streamed tarball cannot seek; expose them as a plain readable stream
+    # so io.TextIOWrapper and pandas accept them
+
+    def __init__(self, member_file):
+        self._member_file = member_file
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._member_file.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def iter_jv_streams(source):
+    # Yield (file_name, binary_stream) one measurement at a time, without reading the
+    # whole member into memory. Use this for very long sweeps; each stream is only
+    # valid until the next one is requested.
+    csv_paths, archive_paths = _list_source(os.path.expanduser(source))
+
+    for file_path in csv_paths:
+        with open(file_path, "rb") as handle:
+            yield os.path.basename(file_path), handle
+
+    for archive_path in archive_paths:
+        if _is_zip(archive_path):
+            with zipfile.ZipFile(archive_path) as archive:
+                for member_name in _zip_member_names(archive_path):
+                    with archive.open(member_name) as handle:
+                        yield os.path.basename(member_name), handle
+        else:
+            for file_name, member_file in _iter_tar_members(archive_path):
+                yield file_name, io.BufferedReader(_ForwardOnlyStream(member_file))
@@ -0,0 +1,197 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from jv_stream import FORWARD, HOLD, R_S_MIN_VOLTAGE, R_SH_MAX_VOLTAGE, REVERSE
+
+
+@dataclass(slots=True)
+class SegmentTable:
+    # One entry per monotonic sweep segment, across every curve of a batch. Segment j
+    # covers points first[j]..last[j] (inclusive) of the concatenated arrays.
+    measurement: np.ndarray
+    direction: np.ndarray
+    first: np.ndarray
+    last: np.ndarray
+    pmax: np.ndarray
+    vmpp: np.ndarray
+    impp: np.ndarray
+    voc: np.ndarray
+    r_s: np.ndarray
+    r_sh: np.ndarray
+    # One entry per curve: (Pmax_reverse - Pmax_forward) / Pmax_reverse, from the
+    # first forward and first reverse segment; NaN if the curve lacks either
+    hysteresis_index: np.ndarray
+    # One entry per curve: the segment whose values stand for the whole curve (its
+    # first forward segment, else its first segment; -1 if the curve has no steps)
+    primary_segment: np.ndarray
+
+    def __len__(self):
+        return len(self.measurement)
+
+    def primary(self, values):
+        # Per-curve view of a per-segment array, taken from each curve's primary segment
+        return _take_or_nan(values, self.primary_segment)
+
+    def to_frame(self):
+        return pd.DataFrame({
+            "measurement": self.measurement, "direction": self.direction,
+            "first": self.first, "last": self.last,
+            "pmax": self.pmax, "vmpp": self.vmpp, "impp": self.impp, "voc": self.voc,
+            "r_s": self.r_s, "r_sh": self.r_sh,
+        })
+
+
+def _fill_zero_steps(step_sign, step_curve):
+    # Give flat steps (dV == 0) the direction of the nearest sloped step in the same
+    # curve: previous one first, otherwise the next one
+    num_steps = len(step_sign)
+    positions = np.arange(num_steps)
+    sloped = step_sign != 0
+
+    previous = np.maximum.accumulate(np.where(sloped, positions, -1))
+    previous_ok = (previous >= 0) & (step_curve[np.maximum(previous, 0)] == step_curve)
+
+    following = np.minimum.accumulate(np.where(sloped, positions, num_steps)[::-1])[::-1]
+    following_ok = (following < num_steps) & (step_curve[np.minimum(following, num_steps - 1)] == step_curve)
+
+    filled = np.where(following_ok, step_sign[np.minimum(following, num_steps - 1)], HOLD)
+    return np.where(previous_ok, step_sign[np.maximum(previous, 0)], filled)
+
+
+def _first_per_group(groups, num_groups):
+    # Index of the first element of each group in a sorted `groups` array (-1 if absent)
+    first = np.full(num_groups, -1, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]]) if len(groups) else np.empty(0, dtype=np.int64)
+    first[groups[starts]] = starts
+    return first
+
+
+def _take_or_nan(values, index):
+    # values[index], with NaN wherever index is -1
+    return np.append(values.astype(np.float64), np.nan)[index]
+
+
+def segment_curves(voltage, current, offsets):
+    # Split every curve (curve i is voltage[offsets[i]:offsets[i + 1]]) at voltage
+    # direction reversals and extract per-segment metrics, all as array operations
+    voltage = np.asarray(voltage, dtype=np.float64)
+    current = np.asarray(current, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    num_curves = len(offsets) - 1
+    point_curve = np.repeat(np.arange(num_curves), np.diff(offsets))
+
+    # Steps between neighbouring points of the same curve (step k joins points k and k+1)
+    steps = np.flatnonzero(point_curve[:-1] == point_curve[1:])
+    step_curve = point_curve[steps]
+    dV = voltage[steps + 1] - voltage[steps]
+    dI = current[steps + 1] - current[steps]
+    step_direction = _fill_zero_steps(np.sign(dV).astype(np.int64), step_curve)
+
+    # A segment starts at each curve's first step and wherever the direction flips
+    new_segment = np.ones(len(steps), dtype=bool)
+    new_segment[1:] = (step_curve[1:] != step_curve[:-1]) | (step_direction[1:] != step_direction[:-1])
+    step_segment = np.cumsum(new_segment) - 1
+    num_segments = int(new_segment.sum())
+
+    # Segment j runs from the start of its first step to the end of its last step, so
+    # a reversal point belongs to both neighbouring segments
+    first_step = np.flatnonzero(new_segment)
+    last_step = np.append(first_step[1:], len(steps))[:num_segments] - 1  # empty if there are no steps
+    first_point = steps[first_step]
+    last_point = steps[last_step] + 1
+    segment_curve = step_curve[first_step]
+    direction = step_direction[first_step]
+
+    # Points of every segment in order: each step's start point, plus the end point of
+    # the segment's last step
+    points = np.insert(steps, last_step + 1, last_point)
+    segment_of_point = np.insert(step_segment, last_step + 1, np.arange(num_segments))
+    segment_starts = first_step + np.arange(num_segments)
+
+    # Maximum power point (generated power is -V*I)
+    power = -voltage[points] * current[points]
+    pmax = np.maximum.reduceat(power, segment_starts) if num_segments else np.empty(0)
+    at_max = np.flatnonzero(power == pmax[segment_of_point])
+    mpp = points[at_max[_first_per_group(segment_of_point[at_max], num_segments)]]
+    vmpp = voltage[mpp]
+    impp = current[mpp]
+
+    # R_s / R_sh: mean dynamic resistance r_d = dV/dI over each segment's steps
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_d = np.where(dI != 0, dV / dI, np.inf)
+    step_voltage = voltage[steps]
+    high_forward = step_voltage > R_S_MIN_VOLTAGE
+    reverse_bias = step_voltage < R_SH_MAX_VOLTAGE
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_s = (np.bincount(step_segment, np.where(high_forward, r_d, 0.0), num_segments)
+               / np.bincount(step_segment, high_forward, num_segments))
+        r_sh = (np.bincount(step_segment, np.where(reverse_bias, r_d, 0.0), num_segments)
+                / np.bincount(step_segment, reverse_bias, num_segments))
+
+    # Voc: voltage at the first current zero crossing inside each segment
+    crossing = np.flatnonzero(np.signbit(current[steps]) != np.signbit(current[steps + 1]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossing_voltage = np.where(dI[crossing] != 0,
+                                    voltage[steps[crossing]] - current[steps[crossing]] * dV[crossing] / dI[crossing],
+                                    voltage[steps[crossing]])
+    first_crossing = _first_per_group(step_segment[crossing], num_segments)
+    voc = _take_or_nan(crossing_voltage, first_crossing)
+
+    # Hysteresis index from the first forward and first reverse segment of each curve
+    forward = np.flatnonzero(direction == FORWARD)
+    reverse = np.flatnonzero(direction == REVERSE)
+    first_forward = _first_per_group(segment_curve[forward], num_curves)
+    first_reverse = _first_per_group(segment_curve[reverse], num_curves)
+    first_any = _first_per_group(segment_curve, num_curves)
+    primary_segment = np.where(first_forward >= 0, np.append(forward, -1)[first_forward], first_any)
+    pmax_forward = _take_or_nan(pmax[forward], first_forward)
+    pmax_reverse = _take_or_nan(pmax[reverse], first_reverse)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hysteresis_index = (pmax_reverse - pmax_forward) / pmax_reverse
+
+    return SegmentTable(
+        measurement=segment_curve,
+        direction=direction,
+        first=first_point,
+        last=last_point,
+        pmax=pmax,
+        vmpp=vmpp,
+        impp=impp,
+        voc=voc,
+        r_s=r_s,
+        r_sh=r_sh,
+        hysteresis_index=hysteresis_index,
+        primary_segment=primary_segment,
+    )
+
+
+if __name__ == "__main__":
+    # Self-check on a known curve: forward 0 -> 0.2 V, reverse 0.2 -> 0 V, forward to 0.1 V,
+    # followed by a single forward sweep as a second curve
+    table = segment_curves(
+        voltage=[0, 0.1, 0.2, 0.1, 0, 0.1, 0, 0.5],
+        current=[-1, -1, -0.8, -0.8, -1, -0.9, -1, 1],
+        offsets=[0, 6, 8],
+    )
+    assert list(table.measurement) == [0, 0, 0, 1]
+    assert list(table.direction) == [FORWARD, REVERSE, FORWARD, FORWARD]
+    assert list(table.first) == [0, 2, 4, 6] and list(table.last) == [2, 4, 5, 7]
+    # The turning point at 0.2 V (P = 0.16) is the maximum power point of both segments
+    assert np.isclose(table.pmax[0], 0.16) and np.isclose(table.vmpp[0], 0.2)
+    assert np.isclose(table.pmax[1], 0.16) and np.isclose(table.vmpp[1], 0.2) and np.isclose(table.pmax[2], 0.09)
+    assert np.isclose(table.voc[3], 0.25) and np.isnan(table.voc[0])
+    assert np.isclose(table.hysteresis_index[0], 0.0) and np.isnan(table.hysteresis_index[1])
+    assert list(table.primary_segment) == [0, 3]
+
+    # Curves without steps (empty, single point) and inputs without any steps at all
+    table = segment_curves(voltage=[0, 0.5, 0.3], current=[-1, 1, 1], offsets=[0, 0, 1, 3])
+    assert list(table.measurement) == [2] and list(table.primary_segment) == [-1, -1, 0]
+    assert np.isnan(table.primary(table.r_s)[:2]).all() and np.isnan(table.hysteresis_index).all()
+    for voltage, offsets in [([], [0, 0]), ([0.1], [0, 1]), ([], [0])]:
+        table = segment_curves(voltage=voltage, current=voltage, offsets=offsets)
+        assert len(table) == 0 and len(table.hysteresis_index) == len(offsets) - 1
+        assert list(table.primary_segment) == [-1] * (len(offsets) - 1)
+        assert np.isnan(table.hysteresis_index).all()
+    print("jv_segments self-check passed")
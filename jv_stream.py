@@ -0,0 +1,207 @@
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+
+# The first 12 rows hold the title row and the NumPads...PCE metadata; IV data follows
+HEADER_ROWS = 12
+
+# Metadata labels for rows 2-12 (indices 1-11)
+METADATA_KEYS = [
+    "NumPads", "Pad Area (sq cm)", "Voc (V)", "Isc (A)", "Jsc (mA/sq cm)",
+    "Vmpp (V)", "Impp (A)", "Jmpp (mA/sq cm)", "Pmax (mW/sq cm)", "FF (%)", "PCE (%)"
+]
+
+# Number of IV rows parsed per slice; memory use is bounded by this, not the file length
+CHUNK_ROWS = 100_000
+
+# Voltage thresholds used by the scripts for the R_s and R_sh estimates
+R_S_MIN_VOLTAGE = 0.4
+R_SH_MAX_VOLTAGE = 0.0
+
+# Sweep direction codes (see jv_segments)
+FORWARD = 1
+REVERSE = -1
+HOLD = 0  # Voltage never changes (e.g. a fixed-bias stability trace)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def read_header(text_stream):
+    # Read only the metadata rows, leaving the stream positioned at the IV block
+    rows = [next(csv.reader([text_stream.readline()]), []) for _ in range(HEADER_ROWS)]
+    metadata_values = [_to_float(row[1]) if len(row) > 1 else np.nan for row in rows[1:HEADER_ROWS]]
+    return {key: value for key, value in zip(METADATA_KEYS, metadata_values)}
+
+
+def iter_iv_chunks(text_stream, chunk_rows=CHUNK_ROWS):
+    # Yield (voltage, current) float64 arrays, `chunk_rows` rows at a time
+    try:
+        reader = pd.read_csv(text_stream, header=None, usecols=[0, 1], chunksize=chunk_rows)
+    except pd.errors.EmptyDataError:
+        return  # Header only, no IV rows
+    for chunk in reader:
+        # Convert columns to numeric values and drop non-numeric rows (e.g. column titles)
+        voltage = pd.to_numeric(chunk.iloc[:, 0], errors='coerce').to_numpy(dtype=np.float64)
+        current = pd.to_numeric(chunk.iloc[:, 1], errors='coerce').to_numpy(dtype=np.float64)
+        valid = ~(np.isnan(voltage) | np.isnan(current))
+        yield voltage[valid], current[valid]
+
+
+class RunningIVStats:
+    # Constant-memory estimators fed one IV slice at a time. The last point of each
+    # slice is carried over so differences and crossings spanning two slices count.
+    #
+    # R_s and R_sh follow the same rule as jv_segments: they are taken from the first
+    # forward sweep run only (or the first run if the curve never sweeps forward), so
+    # forward and reverse scans are not mixed. Flat steps (dV == 0) belong to the run
+    # before them, or to the next one at the start of the curve.
+
+    def __init__(self):
+        self.num_points = 0
+        self._last_voltage = None
+        self._last_current = None
+
+        # Sweep direction tracking: direction and index of the run currently open,
+        # and the index of the first forward run once one is seen
+        self._direction = None
+        self._run = 0
+        self._forward_run = None
+
+        # [r_s sum, r_s count, r_sh sum, r_sh count] of r_d = dV/dI for the first run
+        # and for the first forward run
+        self._first_run_sums = np.zeros(4)
+        self._forward_run_sums = np.zeros(4)
+
+        # Maximum power point (generated power is -V*I, since current is negative there)
+        self.pmax = -np.inf
+        self.vmpp = np.nan
+        self.impp = np.nan
+
+        # Open-circuit voltage from the first zero crossing of the current
+        self.voc = np.nan
+
+    def update(self, voltage, current):
+        if len(voltage) == 0:
+            return
+        self.num_points += len(voltage)
+
+        # Maximum power point within this slice
+        power = -voltage * current
+        best = np.argmax(power)
+        if power[best] > self.pmax:
+            self.pmax = float(power[best])
+            self.vmpp = float(voltage[best])
+            self.impp = float(current[best])
+
+        # Join onto the previous slice so the boundary step is included
+        if self._last_voltage is not None:
+            voltage = np.concatenate(([self._last_voltage], voltage))
+            current = np.concatenate(([self._last_current], current))
+        self._last_voltage = voltage[-1]
+        self._last_current = current[-1]
+
+        if len(voltage) < 2:
+            return
+
+        # Compute dynamic resistance r_d = dV/dI
+        dV = np.diff(voltage)
+        dI = np.diff(current)
+
+        # Avoid division by zero
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r_d = np.where(dI != 0, dV / dI, np.inf)
+
+        # Sweep run of every step in this slice
+        run = self._step_runs(np.sign(dV).astype(np.int64))
+        high_forward = voltage[:-1] > R_S_MIN_VOLTAGE
+        reverse = voltage[:-1] < R_SH_MAX_VOLTAGE
+
+        def add_sums(sums, in_run):
+            sums += (r_d[high_forward & in_run].sum(), (high_forward & in_run).sum(),
+                     r_d[reverse & in_run].sum(), (reverse & in_run).sum())
+
+        add_sums(self._first_run_sums, run == 0)
+        if self._forward_run not in (None, 0):
+            add_sums(self._forward_run_sums, run == self._forward_run)
+
+        # Voc: interpolate the voltage at the first sign change of the current
+        if np.isnan(self.voc):
+            crossings = np.nonzero(np.signbit(current[:-1]) != np.signbit(current[1:]))[0]
+            if len(crossings) > 0:
+                k = crossings[0]
+                if dI[k] != 0:
+                    self.voc = float(voltage[k] - current[k] * dV[k] / dI[k])
+                else:
+                    self.voc = float(voltage[k])
+
+    def _step_runs(self, step_sign):
+        # Run index of each step, carrying the open run over from the previous slice
+        if self._direction is None:
+            sloped = np.flatnonzero(step_sign != 0)
+            if len(sloped) == 0:
+                return np.zeros(len(step_sign), dtype=np.int64)  # Still flat: first run
+            self._direction = step_sign[sloped[0]]  # Leading flat steps join the first run
+
+        # Flat steps take the direction of the last sloped step
+        positions = np.where(step_sign != 0, np.arange(len(step_sign)), -1)
+        positions = np.maximum.accumulate(positions)
+        direction = np.where(positions >= 0, step_sign[np.maximum(positions, 0)], self._direction)
+
+        changed = np.empty(len(direction), dtype=bool)
+        changed[0] = direction[0] != self._direction
+        changed[1:] = direction[1:] != direction[:-1]
+        run = self._run + np.cumsum(changed)
+
+        if self._forward_run is None:
+            forward = np.flatnonzero(direction == FORWARD)
+            if len(forward) > 0:
+                self._forward_run = int(run[forward[0]])
+
+        self._direction = direction[-1]
+        self._run = int(run[-1])
+        return run
+
+    def _primary_sums(self):
+        # The first forward run if there is one after the first run, else the first run
+        return self._forward_run_sums if self._forward_run not in (None, 0) else self._first_run_sums
+
+    @property
+    def r_s(self):
+        # Series resistance: mean r_d in the high forward bias region (V > 0.4 V)
+        r_s_sum, r_s_count = self._primary_sums()[:2]
+        return r_s_sum / r_s_count if r_s_count > 0 else None
+
+    @property
+    def r_sh(self):
+        # Shunt resistance: mean r_d in the reverse bias region (V < 0 V)
+        r_sh_sum, r_sh_count = self._primary_sums()[2:]
+        return r_sh_sum / r_sh_count if r_sh_count > 0 else None
+
+    def result(self):
+        return {
+            "R_s": self.r_s,
+            "R_sh": self.r_sh,
+            "Vmpp (V)": self.vmpp,
+            "Impp (A)": self.impp,
+            "Pmax (W)": self.pmax if self.num_points > 0 else np.nan,
+            "Voc (V)": self.voc,
+        }
+
+
+def scan_jv_stream(binary_stream, chunk_rows=CHUNK_ROWS):
+    # Read one '_JV.csv' measurement in fixed-size slices; returns (metadata, stats)
+    text_stream = io.TextIOWrapper(binary_stream, encoding="utf-8", errors="replace", newline="")
+    metadata = read_header(text_stream)
+    stats = RunningIVStats()
+    for voltage, current in iter_iv_chunks(text_stream, chunk_rows):
+        stats.update(voltage, current)
+    # Detach so closing the wrapper does not close the caller's stream
+    text_stream.detach()
+    return metadata, stats
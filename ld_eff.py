@@ -1,15 +1,18 @@
+import io
 import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
+
+from jv_loader import iter_jv_files
 import matplotlib.cm as cm
 import matplotlib.colors as mcolors
 
 # Define the folder path containing the CSV files
 folder_path = os.path.expanduser("Fri1")
 
-# Get all CSV files that end with '_JV.csv' in the folder
-csv_files = [f for f in os.listdir(folder_path) if f.endswith("_JV.csv")]
+# Stream all '_JV.csv' files from the folder, or from a .zip / .tar.gz archive of it
+csv_files = iter_jv_files(folder_path)
 
 # Lists to store IV data for plotting
 light_data = []
@@ -18,9 +21,7 @@ efficiencies_light = []
 efficiencies_dark = []
 
 # Loop through each CSV file and process the data
-for file_name in csv_files:
-    file_path = os.path.join(folder_path, file_name)
-
+for file_name, raw_data in csv_files:
     # Convert filename to lowercase and check for "dark" or "light"
     file_name_lower = file_name.lower()
     if "dark" in file_name_lower:
@@ -33,7 +34,7 @@ for file_name in csv_files:
 
     try:
         # Read the CSV file
-        data = pd.read_csv(file_path, header=None)
+        data = pd.read_csv(io.BytesIO(raw_data), header=None)
 
         # Extract metadata from rows 2-12 (i.e., row indices 1-11)
         metadata_keys = [
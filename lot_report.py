@@ -0,0 +1,229 @@
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from jv_loader import is_archive
+from measurement import read_batch
+
+# Bump when the plotting code changes so cached figures are re-rendered
+RENDERER_VERSION = 1
+
+# Dictionary with cell metadata
+cells = {
+    "ID": [10, 15, 12, 3, 8, 9, 6, 5, 4, 11, 12, 2, 7, 13, 1, 14],
+    "W (µm)": [24, 24, 24, 24, 24, 24, 24, 24, 24, 14, 24, 36, 54, 104, 204, 404],
+    "N": [0, 5, 20, 50, 100, 200, 400, 600, 800, 20, 20, 20, 20, 20, 20, 20],
+    "Metal Coverage (%)": [0, 1, 3, 8, 15, 30, 60, 90, 100, 2, 3, 5, 7, 13, 26, 51]
+}
+
+# Cross-cell scatter plots from the analysis scripts:
+# (title, x column, y column, x label, y label, color, marker, linear fit)
+SCATTER_PLOTS = [
+    ("Jmpp vs. Metal Coverage", "Metal Coverage (%)", "jmpp", "Metal Coverage (%)", "Jmpp (mA/sq cm)", "red", "o", False),
+    ("Jmpp vs. Number of Fingers", "N", "jmpp", "Number of Fingers", "Jmpp (mA/sq cm)", "green", "s", False),
+    ("Isc vs. Metal Coverage", "Metal Coverage (%)", "isc", "Metal Coverage (%)", "Isc (mA)", "blue", "^", False),
+    ("Efficiency vs. Number of Fingers", "N", "pce", "Number of Fingers (N)", "Efficiency (PCE %)", "red", "o", False),
+    ("Fill Factor vs. Finger Spacing", "Pitch (µm)", "ff", "Finger Spacing (Pitch) [µm]", "Fill Factor (FF %)", "blue", "o", True),
+    ("Series Resistance vs. Efficiency", "r_s", "pce", "Series Resistance (R_s) [Ω]", "Efficiency (%)", "blue", "^", False),
+]
+
+# Header fields shown in the text box of each IV plot
+IV_TEXT_FIELDS = ["pad_area", "voc", "isc", "jsc", "vmpp", "impp", "jmpp", "pmax", "ff", "pce"]
+
+
+def figure_key(kind, params, arrays):
+    # Content address of a figure: hash of the plot parameters and the exact input data
+    digest = hashlib.sha256()
+    digest.update(json.dumps([RENDERER_VERSION, kind, params], sort_keys=True, default=str).encode())
+    for name in sorted(arrays):
+        array = np.ascontiguousarray(arrays[name])
+        digest.update(f"{name}:{array.dtype.str}:{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()[:32]
+
+
+def _plot_iv(ax, params, arrays):
+    # Single-cell IV curve, drawn like presentation_code.py
+    voltage, current = arrays["voltage"], arrays["current"]
+    if params["plot_type"] == "linear":
+        ax.plot(voltage, current, marker='o', linestyle='-', label=f"{params['file_name']} IV Curve")
+    else:
+        ax.plot(voltage, np.abs(current), marker='o', linestyle='-', label=f"{params['file_name']} IV Curve (Semi-Log)")
+        ax.set_yscale('log')
+
+    # Add metadata text box
+    ax.text(0.05, 0.75, params["metadata_text"], transform=ax.transAxes,
+            fontsize=10, verticalalignment='top', bbox=dict(facecolor='white', alpha=0.8))
+
+    ax.set_xlabel("Voltage (V)", fontsize=14)
+    ax.set_ylabel("Current (A)" if params["plot_type"] == "linear" else "Log(Current) (A)", fontsize=14)
+    ax.set_title(f"Voltage vs. {'Log(Current)' if params['plot_type'] == 'semi-log' else 'Current'} ({params['file_name']})", fontsize=16)
+    ax.legend(fontsize=12)
+
+
+def _plot_scatter(ax, params, arrays):
+    # Cross-cell scatter plot, drawn like the Jsc_v_Metal / eff_num / ff_space / rs_metal scripts
+    x, y = arrays["x"], arrays["y"]
+    ax.scatter(x, y, color=params["color"], marker=params["marker"], label=params["title"])
+
+    # Linear fit (only if we have enough data points)
+    if params["fit"] and len(x) > 1:
+        slope, intercept = np.polyfit(x, y, 1)
+        x_fit = np.linspace(min(x), max(x), 100)
+        ax.plot(x_fit, slope * x_fit + intercept, linestyle='-', color='red',
+                label=f"Linear Fit: y = {slope:.2f}x + {intercept:.2f}")
+
+    ax.set_xlabel(params["xlabel"], fontsize=14)
+    ax.set_ylabel(params["ylabel"], fontsize=14)
+    ax.set_title(params["title"], fontsize=16)
+    ax.legend(fontsize=12)
+
+
+FIGURE_PLOTTERS = {"iv": _plot_iv, "scatter": _plot_scatter}
+
+
+def render_figure(output_path, kind, params, arrays):
+    # Worker entry point: draw one figure off-screen and save it as PNG
+    fig = Figure(figsize=(8, 6))
+    ax = fig.add_subplot()
+    FIGURE_PLOTTERS[kind](ax, params, arrays)
+    ax.tick_params(labelsize=12)
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+    fig.tight_layout()
+
+    # Write next to the target and rename, so an interrupted run never leaves a partial
+    # PNG under a valid cache key
+    partial_path = f"{output_path}.{os.getpid()}.part"
+    fig.savefig(partial_path, format="png", dpi=100)
+    os.replace(partial_path, output_path)
+    return output_path
+
+
+def build_summary(batch):
+    # One row per measurement, joined with the cell design table and the hysteresis index.
+    # R_s, R_sh and the hysteresis index all come from the batch's single segment table.
+    summary = batch.to_frame()
+    summary["pce"] = summary["pce"].abs()
+    summary["hysteresis_index"] = batch.segments().hysteresis_index
+
+    cell_data = pd.DataFrame(cells).drop_duplicates("ID")
+    cell_data["Pitch (µm)"] = cell_data["W (µm)"] / cell_data["N"].where(cell_data["N"] > 0)  # NaN when N = 0
+    return summary.merge(cell_data, how="left", left_on="cell_id", right_on="ID").drop(columns="ID")
+
+
+def figure_jobs(batch, summary):
+    # (section, caption, kind, params, arrays) for every figure in the report
+    jobs = []
+
+    # ---- PER-CELL IV CURVES ----
+    for measurement in batch:
+        if measurement.sweep is None:
+            continue  # Same rule as the scripts: only "dark" or "light" files are plotted
+        metadata_text = "\n".join(
+            f"{key}: {getattr(measurement, key):.3f}" for key in IV_TEXT_FIELDS
+            if not np.isnan(getattr(measurement, key))
+        )
+        params = {
+            "file_name": measurement.file_name,
+            "plot_type": "linear" if measurement.sweep == "light" else "semi-log",
+            "metadata_text": metadata_text,
+        }
+        arrays = {"voltage": measurement.voltage, "current": measurement.current}
+        jobs.append(("IV Curves", measurement.file_name, "iv", params, arrays))
+
+    # ---- CROSS-CELL SCATTER PLOTS (light files only) ----
+    light = summary[summary["sweep"] == "light"]
+    for title, x_column, y_column, xlabel, ylabel, color, marker, fit in SCATTER_PLOTS:
+        points = light[[x_column, y_column]].astype(float).dropna()
+        params = {"xlabel": xlabel, "ylabel": ylabel, "title": title, "color": color, "marker": marker, "fit": fit}
+        arrays = {"x": points[x_column].to_numpy(), "y": points[y_column].to_numpy()}
+        jobs.append(("Cross-Cell Trends", title, "scatter", params, arrays))
+
+    return jobs
+
+
+def _format_value(value, sig_figs=3):
+    # Format values with reasonable significant figures
+    if isinstance(value, str):
+        return html.escape(value)
+    if value is None or pd.isna(value):
+        return "N/A"
+    return f"{value:.{sig_figs}g}"
+
+
+def write_report(folder_path, report_folder, workers=None):
+    # Render a lot into report_folder/index.html plus report_folder/figures/<hash>.png.
+    # Figures whose hash already exists on disk are reused instead of re-rendered.
+    batch = read_batch(folder_path, workers=workers)
+    summary = build_summary(batch)
+    jobs = figure_jobs(batch, summary)
+
+    figure_folder = os.path.join(report_folder, "figures")
+    os.makedirs(figure_folder, exist_ok=True)
+
+    figure_files = []
+    pending = []
+    for section, caption, kind, params, arrays in jobs:
+        file_name = f"{figure_key(kind, params, arrays)}.png"
+        figure_files.append(file_name)
+        output_path = os.path.join(figure_folder, file_name)
+        if not os.path.exists(output_path):
+            pending.append((output_path, kind, params, arrays))
+
+    # Render only the figures whose inputs changed, spread over a process pool
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(render_figure, *zip(*pending)))
+
+    # Drop figures no longer referenced by this report
+    for stale in set(os.listdir(figure_folder)) - set(figure_files):
+        os.remove(os.path.join(figure_folder, stale))
+
+    # ---- HTML BUNDLE ----
+    table_html = summary.to_html(index=False, formatters={c: _format_value for c in summary.columns}, escape=False, border=0, na_rep="N/A")
+    sections = {}
+    for (section, caption, _, _, _), file_name in zip(jobs, figure_files):
+        sections.setdefault(section, []).append(
+            f'<figure><img src="figures/{file_name}" alt="{html.escape(caption)}">'
+            f'<figcaption>{html.escape(caption)}</figcaption></figure>'
+        )
+
+    lot_name = html.escape(os.path.basename(os.path.normpath(folder_path)))
+    body = [f"<h1>Lot Report: {lot_name}</h1>", "<h2>Summary</h2>", table_html]
+    for section, figures in sections.items():
+        body.append(f"<h2>{html.escape(section)}</h2>")
+        body.append('<div class="figures">' + "\n".join(figures) + "</div>")
+
+    page = "\n".join([
+        "<!DOCTYPE html>",
+        '<html><head><meta charset="utf-8">',
+        f"<title>Lot Report: {lot_name}</title>",
+        "<style>body{font-family:sans-serif;margin:2em} table{border-collapse:collapse;font-size:12px}"
+        " th,td{border:1px solid #ccc;padding:2px 6px} .figures{display:flex;flex-wrap:wrap;gap:1em}"
+        " figure{margin:0} img{width:480px}</style>",
+        "</head><body>",
+        *body,
+        "</body></html>",
+    ])
+    index_path = os.path.join(report_folder, "index.html")
+    with open(index_path, "w", encoding="utf-8") as handle:
+        handle.write(page)
+
+    print(f"Rendered {len(pending)} of {len(jobs)} figures ({len(jobs) - len(pending)} cached)")
+    return index_path
+
+
+if __name__ == "__main__":
+    # Define the folder path (or .zip / .tar.gz archive) containing the CSV files
+    folder_path = os.path.expanduser("Fri1")
+
+    # Write the report next to the archive if reading one, otherwise inside the folder
+    report_root = os.path.dirname(folder_path) if is_archive(folder_path) else folder_path
+    index_path = write_report(folder_path, os.path.join(report_root, "Report"))
+    print(f"Saved lot report: {index_path}")
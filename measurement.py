@@ -0,0 +1,228 @@
+import io
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from jv_loader import cell_id, iter_jv_files, sweep_type
+from jv_segments import segment_curves
+from jv_stream import METADATA_KEYS, iter_iv_chunks, read_header
+
+# Attribute names for the NumPads...PCE header rows, in file order (see METADATA_KEYS)
+HEADER_FIELDS = [
+    "num_pads", "pad_area", "voc", "isc", "jsc",
+    "vmpp", "impp", "jmpp", "pmax", "ff", "pce"
+]
+
+# Parameters derived from the IV curve rather than read from the header. They come from
+# jv_segments: the primary segment of each curve (its first forward sweep, else its
+# first sweep), so forward and reverse scans are never mixed.
+DERIVED_FIELDS = ["r_s", "r_sh"]
+
+
+@dataclass(slots=True)
+class Measurement:
+    # One '_JV.csv' file: typed header values, the IV arrays and derived parameters.
+    # Slotted so a whole lot can be held in memory without a DataFrame per file.
+    file_name: str
+    cell_id: int
+    sweep: str
+    num_pads: float
+    pad_area: float
+    voc: float
+    isc: float
+    jsc: float
+    vmpp: float
+    impp: float
+    jmpp: float
+    pmax: float
+    ff: float
+    pce: float
+    voltage: np.ndarray
+    current: np.ndarray
+    r_s: float
+    r_sh: float
+
+
+def _as_float(value):
+    return np.nan if value is None else float(value)
+
+
+def read_measurement(file_name, binary_stream, dtype=np.float64, derive=True):
+    # Parse one measurement straight into typed fields; `dtype` (float32 or float64)
+    # sets the precision of the stored voltage/current arrays. With derive=False the
+    # derived fields are left NaN (BatchBuilder fills them for the whole batch at once).
+    text_stream = io.TextIOWrapper(binary_stream, encoding="utf-8", errors="replace", newline="")
+    metadata = read_header(text_stream)
+
+    voltage_chunks = []
+    current_chunks = []
+    for voltage, current in iter_iv_chunks(text_stream):
+        voltage_chunks.append(voltage.astype(dtype, copy=False))
+        current_chunks.append(current.astype(dtype, copy=False))
+    text_stream.detach()
+
+    try:
+        measurement_cell_id = cell_id(file_name)
+    except (IndexError, ValueError):
+        measurement_cell_id = -1  # Filename does not follow "Fri1-10-Light_JV.csv"
+
+    voltage = np.concatenate(voltage_chunks) if voltage_chunks else np.empty(0, dtype=dtype)
+    current = np.concatenate(current_chunks) if current_chunks else np.empty(0, dtype=dtype)
+    derived_values = dict.fromkeys(DERIVED_FIELDS, np.nan)
+    if derive:
+        segments = segment_curves(voltage, current, [0, len(voltage)])
+        derived_values = {name: float(segments.primary(getattr(segments, name))[0]) for name in DERIVED_FIELDS}
+
+    header_values = {name: _as_float(metadata[key]) for name, key in zip(HEADER_FIELDS, METADATA_KEYS)}
+    return Measurement(
+        file_name=file_name,
+        cell_id=measurement_cell_id,
+        sweep=sweep_type(file_name),
+        voltage=voltage,
+        current=current,
+        **derived_values,
+        **header_values,
+    )
+
+
+@dataclass(slots=True)
+class MeasurementBatch:
+    # Columnar store for many measurements: one array per scalar field and all IV
+    # points concatenated, with curve i at voltage[offsets[i]:offsets[i + 1]]
+    file_names: list
+    cell_ids: np.ndarray
+    sweeps: list
+    header: dict
+    derived: dict
+    voltage: np.ndarray
+    current: np.ndarray
+    offsets: np.ndarray
+    # Segment table from the batched extraction pass (see BatchBuilder.build)
+    segment_table: object = None
+
+    @classmethod
+    def from_measurements(cls, measurements, dtype=np.float64):
+        builder = BatchBuilder(dtype)
+        for measurement in measurements:
+            builder.append(measurement)
+        return builder.build()
+
+    def __len__(self):
+        return len(self.file_names)
+
+    def curve(self, index):
+        # (voltage, current) views for one measurement; no copy
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return self.voltage[start:stop], self.current[start:stop]
+
+    def __getitem__(self, index):
+        voltage, current = self.curve(index)
+        values = {name: float(column[index]) for name, column in self.header.items()}
+        values.update({name: float(column[index]) for name, column in self.derived.items()})
+        return Measurement(
+            file_name=self.file_names[index],
+            cell_id=int(self.cell_ids[index]),
+            sweep=self.sweeps[index],
+            voltage=voltage,
+            current=current,
+            **values,
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def segments(self):
+        # Split every curve at voltage reversals; per-segment metrics and a hysteresis
+        # index per measurement, computed over the whole batch at once
+        if self.segment_table is None:
+            self.segment_table = segment_curves(self.voltage, self.current, self.offsets)
+        return self.segment_table
+
+    def to_frame(self):
+        # One row per measurement with the scalar fields (no IV arrays)
+        frame = pd.DataFrame({"file_name": self.file_names, "cell_id": self.cell_ids, "sweep": self.sweeps})
+        for name, column in {**self.header, **self.derived}.items():
+            frame[name] = column
+        return frame
+
+
+class BatchBuilder:
+    # Fills a MeasurementBatch one measurement at a time. IV points are copied into
+    # concatenated arrays that grow by doubling, so each measurement's own arrays can
+    # be dropped as soon as it is appended. A builder is single-use: build() hands its
+    # arrays to the batch, after which append() raises.
+
+    def __init__(self, dtype=np.float64, capacity=1024):
+        self.dtype = dtype
+        self.num_points = 0
+        self.voltage = np.empty(capacity, dtype=dtype)
+        self.current = np.empty(capacity, dtype=dtype)
+        self.offsets = [0]
+        self.file_names = []
+        self.cell_ids = []
+        self.sweeps = []
+        self.values = {name: [] for name in HEADER_FIELDS}
+        self.built = False
+
+    def _grow(self, array, capacity):
+        # Allocate and copy rather than resizing in place, which could move memory
+        # that something else still holds a view of
+        grown = np.empty(capacity, dtype=self.dtype)
+        grown[:self.num_points] = array[:self.num_points]
+        return grown
+
+    def append(self, measurement):
+        if self.built:
+            raise RuntimeError("BatchBuilder.append() called after build(); use a new builder")
+        stop = self.num_points + len(measurement.voltage)
+        if stop > len(self.voltage):
+            capacity = max(stop, 2 * len(self.voltage))
+            self.voltage = self._grow(self.voltage, capacity)
+            self.current = self._grow(self.current, capacity)
+        self.voltage[self.num_points:stop] = measurement.voltage
+        self.current[self.num_points:stop] = measurement.current
+        self.num_points = stop
+
+        self.offsets.append(stop)
+        self.file_names.append(measurement.file_name)
+        self.cell_ids.append(measurement.cell_id)
+        self.sweeps.append(measurement.sweep)
+        for name, column in self.values.items():
+            column.append(getattr(measurement, name))
+
+    def build(self):
+        if self.built:
+            raise RuntimeError("BatchBuilder.build() called twice; use a new builder")
+        self.built = True
+
+        # Hand over exactly-sized arrays; the grown buffers are released with the builder
+        voltage = self.voltage[:self.num_points].copy()
+        current = self.current[:self.num_points].copy()
+        self.voltage = self.current = None
+        offsets = np.array(self.offsets, dtype=np.int64)
+
+        # One segmentation pass over every curve yields the derived parameters, the
+        # per-segment metrics and the hysteresis index together
+        segments = segment_curves(voltage, current, offsets)
+        return MeasurementBatch(
+            file_names=self.file_names,
+            cell_ids=np.array(self.cell_ids, dtype=np.int64),
+            sweeps=self.sweeps,
+            header={name: np.array(self.values[name], dtype=np.float64) for name in HEADER_FIELDS},
+            derived={name: segments.primary(getattr(segments, name)) for name in DERIVED_FIELDS},
+            voltage=voltage,
+            current=current,
+            offsets=offsets,
+            segment_table=segments,
+        )
+
+
+def read_batch(source, dtype=np.float64, workers=None):
+    # Load every '_JV.csv' measurement in a folder or archive into a MeasurementBatch.
+    # Each file is parsed, appended and released before the next one is kept.
+    builder = BatchBuilder(dtype)
+    for file_name, raw_data in iter_jv_files(source, workers):
+        builder.append(read_measurement(file_name, io.BytesIO(raw_data), dtype, derive=False))
+    return builder.build()
@@ -1,3 +1,4 @@
+import io
 import os
 import pandas as pd
 import matplotlib
@@ -6,6 +7,8 @@ matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 import numpy as np
 
+from jv_loader import iter_jv_files
+
 
 cells = {
     "ID": [10, 15, 12, 3, 8, 9, 6, 5, 4, 11, 12, 2, 7, 13, 1, 14],
@@ -20,13 +23,11 @@ cell_data = pd.DataFrame(cells)
 # Define the folder path containing the CSV files
 folder_path = os.path.expanduser("Fri1")
 
-# Get all CSV files that end with '_JV.csv' in the folder
-csv_files = [f for f in os.listdir(folder_path) if f.endswith("_JV.csv")]
+# Stream all '_JV.csv' files from the folder, or from a .zip / .tar.gz archive of it
+csv_files = iter_jv_files(folder_path)
 
 # Loop through each CSV file and process the data
-for file_name in csv_files:
-    file_path = os.path.join(folder_path, file_name)
-
+for file_name, raw_data in csv_files:
     # Convert filename to lowercase and check for "dark" or "light"
     file_name_lower = file_name.lower()
     if "dark" in file_name_lower:
@@ -39,7 +40,7 @@ for file_name in csv_files:
 
     try:
         # Read the CSV file
-        dark_data = pd.read_csv(file_path, header=None)
+        dark_data = pd.read_csv(io.BytesIO(raw_data), header=None)
 
         # Extract metadata from rows 1-11
         metadata_keys = [
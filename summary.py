@@ -2,67 +2,36 @@ import os
 import pandas as pd
 import numpy as np
 
+from jv_loader import is_archive, iter_jv_streams
+from jv_stream import scan_jv_stream
+
 # Define the folder path containing the CSV files
 folder_path = os.path.expanduser("Fri1")
 
-# Create a subdirectory to store all summary tables
-summary_folder = os.path.join(folder_path, "Summaries")
+# Create a subdirectory to store all summary tables (next to the archive if reading one)
+summary_root = os.path.dirname(folder_path) if is_archive(folder_path) else folder_path
+summary_folder = os.path.join(summary_root, "Summaries")
 os.makedirs(summary_folder, exist_ok=True)  # Create folder if it doesn't exist
 
-# Get all CSV files that end with '_JV.csv' in the folder
-csv_files = [f for f in os.listdir(folder_path) if f.endswith("_JV.csv")]
+# Stream each '_JV.csv' file from the folder or archive one at a time; the IV block is
+# parsed in fixed-size slices so very long sweeps run in constant memory
+csv_files = iter_jv_streams(folder_path)
 
 # Loop through each CSV file and process the data
-for file_name in csv_files:
-    file_path = os.path.join(folder_path, file_name)
-
+for file_name, file_stream in csv_files:
     # Read the CSV file
     try:
-        data = pd.read_csv(file_path, header=None)
-
-        # Correct metadata labels (rows 2-12 → indices 1-11)
-        metadata_keys = [
-            "NumPads", "Pad Area (sq cm)", "Voc (V)", "Isc (A)", "Jsc (mA/sq cm)",
-            "Vmpp (V)", "Impp (A)", "Jmpp (mA/sq cm)", "Pmax (mW/sq cm)", "FF (%)", "PCE (%)"
-        ]
-
-        # Convert metadata values to numeric, handling errors
-        metadata_values = pd.to_numeric(data.iloc[1:12, 1], errors='coerce').values
-        metadata = {key: value for key, value in zip(metadata_keys, metadata_values)}
+        # Read metadata rows 2-12 (indices 1-11), then run the IV estimators slice by slice
+        metadata, iv_stats = scan_jv_stream(file_stream)
 
         # Ensure PCE is positive
         if "PCE (%)" in metadata and not np.isnan(metadata["PCE (%)"]):
             metadata["PCE (%)"] = abs(metadata["PCE (%)"])
 
-        # Skip the first 12 rows and extract IV data
-        iv_data = data.iloc[12:].reset_index(drop=True)
-
-        # Convert columns to numeric values, handling errors
-        iv_data.iloc[:, 0] = pd.to_numeric(iv_data.iloc[:, 0], errors='coerce')
-        iv_data.iloc[:, 1] = pd.to_numeric(iv_data.iloc[:, 1], errors='coerce')
-
-        # Drop rows with NaN values
-        iv_data = iv_data.dropna()
-
-        # Extract voltage and current as NumPy arrays
-        voltage = iv_data.iloc[:, 0].values
-        current = iv_data.iloc[:, 1].values
-
-        # Compute dynamic resistance r_d = dV/dI
-        dV = np.diff(voltage)
-        dI = np.diff(current)
-
-        # Avoid division by zero
-        with np.errstate(divide='ignore', invalid='ignore'):
-            r_d = np.where(dI != 0, dV / dI, np.inf)
-
-        # Estimate R_s (Series Resistance) from high forward bias region (V > 0.4V)
-        high_forward_indices = np.where(voltage[:-1] > 0.4)[0]
-        R_s = np.mean(r_d[high_forward_indices]) if len(high_forward_indices) > 0 else None
-
-        # Estimate R_sh (Shunt Resistance) from reverse bias region (V < 0V)
-        reverse_indices = np.where(voltage[:-1] < 0)[0]
-        R_sh = np.mean(r_d[reverse_indices]) if len(reverse_indices) > 0 else None
+        # Series resistance (mean r_d for V > 0.4V) and shunt resistance (mean r_d for V < 0V),
+        # from the first forward sweep only, as in the lot report
+        R_s = iv_stats.r_s
+        R_sh = iv_stats.r_sh
 
         # Format values with reasonable significant figures
         def format_value(value, sig_figs=3):